@@ -20,11 +20,13 @@ def compute_performance_score(
     forecast_df_path: Union[str, Path, pl.DataFrame],
     auction_dir: Union[str, Path, pl.DataFrame],
     save_dir: Union[str, Path] = os.getcwd(),
-) -> None:
+) -> pl.DataFrame:
     """Calculate and display performance metrics based on auction and forecast data.
 
     This function reads forecast and auction data, computes price differences, and 
     generates performance metrics for the forecasts. It can also save the results to a specified directory.
+    The merge and the price differences are built as one lazy query, which is collected once and then shared 
+    by the saving and the metrics.
 
     Args:
         forecast_df_path (Union[str, Path, pl.DataFrame]): The path to the forecast data file 
@@ -35,22 +37,23 @@ def compute_performance_score(
             Defaults to the current working directory.
 
     Returns:
-        None
+        pl.DataFrame: A DataFrame with the merged forecast and auction data, including the price differences.
     """
 
     # First read all forecast and auction data
     forecast_auction_mathces = match_auction_with_forecast(forecast_df_or_path=forecast_df_path, auction_df_or_dir=auction_dir)
     
     # Match the forecast data with the auction data
-    merged_forecast_auction_df = merge_forecast_and_auction_dataframes(forecast_auction_mathces)
+    merged_forecast_auction_lf = merge_forecast_and_auction_dataframes(forecast_auction_mathces)
     
-    # Compute price differences
-    merged_forecast_auction_df = merged_forecast_auction_df.with_columns([
+    # Compute price differences - both expressions are evaluated in a single pass by the lazy engine.
+    # The merged data is collected once here, so the saving and the metrics don't each rerun the merge
+    merged_forecast_auction_df = merged_forecast_auction_lf.with_columns([
         (pl.col("DK1_forecast_price") - pl.col("Auction_Price_DK1")).alias("Price_Diff_DK1"),
         (pl.col("DK2_forecast_price") - pl.col("Auction_Price_DK2")).alias("Price_Diff_DK2")
-    ])
+    ]).collect()
     
-    # Save the resulting dataframe 
+    # Save the resulting dataframe
     if save_dir:
         merged_forecast_auction_df = make_df_more_readable(pl_data=merged_forecast_auction_df)
         save_results_as_csv_and_plots(merged_forecast_auction_df, save_dir)
@@ -68,10 +71,11 @@ def compute_performance_score(
 
 # Run from CLI 
 if __name__ == "__main__":
+    cwd = os.getcwd()
     parser = argparse.ArgumentParser(description="Read the forecast data from the csv file")
     parser.add_argument("--forecast_df_path", type=str, default="IBForecastNoScenariosDK.csv", help="Path to the forecast data")
-    parser.add_argument("--auction_dir", type=str, default=os.getcwd(), help="Path to the data directory")
-    parser.add_argument("--save_dir", type=str, default=os.path.join(os.getcwd(), "results_dir"), help="Path to save the resulting csv file")
+    parser.add_argument("--auction_dir", type=str, default=cwd, help="Path to the data directory")
+    parser.add_argument("--save_dir", type=str, default=os.path.join(cwd, "results_dir"), help="Path to save the resulting csv file")
     args = parser.parse_args()
 
     # Edit the args
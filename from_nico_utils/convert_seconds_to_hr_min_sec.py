@@ -1,4 +1,3 @@
-import numpy as np
 import argparse
 import sys
 sys.dont_write_bytecode = True                      # Dont create the __pycache__ folder
@@ -29,10 +28,9 @@ def seconds_to_hrs_min_sec(seconds: int, sec_precision: int = None) -> str:
         sec_precision = 2 if seconds < 20 else 0
 
     # Compute the number of days, hrs, minutes, seconds are present in this amount of seconds
-    days = np.floor(seconds/(3600*24))
-    hrs = np.floor((seconds-days*3600*24)/3600)
-    mins = np.floor((seconds-days*3600*24-hrs*3600)/60)
-    secs = np.mod(seconds, 60)
+    days, remaining_secs = divmod(seconds, 3600*24)
+    hrs, remaining_secs = divmod(remaining_secs, 3600)
+    mins, secs = divmod(remaining_secs, 60)
 
     # Convert the time periods into strings
     days_string = "{:.0f}days:".format(days) if days > 0 else ""
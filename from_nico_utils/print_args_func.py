@@ -1,11 +1,12 @@
+import math
 import numbers
 import argparse
-import numpy as np
-from natsort import natsorted
-from copy import deepcopy
 from typing import Callable, Optional
 from .str2bool_func import str2bool
 
+# The opening and closing brackets used when printing each sequence type, including its subclasses. Any other sequence type is printed with {}
+_SEQUENCE_BRACKETS = {list: "[]", tuple: "()"}
+
 
 # Define a function capable of printing the arguments from our Namespace object
 def print_args(
@@ -32,23 +33,22 @@ def print_args(
     # Always use flush==True, if verbose_func==print, to ensure that the output is printed immediately
     kwargs = {"flush": True} if verbose_func == print else {}
 
-    # First copy the namespace as a dictionary and sort it by the keys
-    args_dict = deepcopy(args.__dict__)
-    args_dict_sorted = {k: args_dict[k]
-                        for k in natsorted(args_dict.keys(), key=lambda x: x.lower())}
+    # Sort the argument names - only the keys are sorted, so the argument values are never copied
+    args_dict = vars(args)
+    args_dict_sorted = {k: args_dict[k] for k in sorted(args_dict, key=str.lower)}
     if not init_str.endswith(":"):
         init_str += ":"
 
     # Read the ljust_length from the longest key in the args_dict_sorted, if not provided
     if ljust_length is None:
         try:
-            ljust_length = int(np.ceil(np.max([len(k) for k in args_dict_sorted]) / 5) + 5)
+            ljust_length = math.ceil(max(map(len, args_dict_sorted)) / 5) + 5
         except Exception as ex:
             print(f"Experienced an error when trying to determine the ljust_length:\n{ex}")
             ljust_length = 25
 
-    # Initiate the string to be printed
-    string_to_output = f'\n{init_str}'
+    # Initiate the parts of the string to be printed - they are joined into a single string once all arguments are formatted
+    output_parts = [f'\n{init_str}']
 
     # Run through each argument and the corresponding value and print those
     for arg_key, arg_val in args_dict_sorted.items():
@@ -60,9 +60,9 @@ def print_args(
             print_arg_val = format_sequence_argval(arg_val, start_of_string_print)
         else:
             print_arg_val = arg_val
-        string_to_output += f"{start_of_string_print}{print_arg_val}"
-    string_to_output += "\n"
-    verbose_func(string_to_output, **kwargs)
+        output_parts.append(f"{start_of_string_print}{print_arg_val}")
+    output_parts.append("\n")
+    verbose_func("".join(output_parts), **kwargs)
 
 
 def format_sequence_argval(arg_val, start_of_string_print) -> str:
@@ -90,26 +90,25 @@ def format_sequence_argval(arg_val, start_of_string_print) -> str:
         >>> format_sequence_argval((5, 4, 6), "Start:")
         '(4,\n 5,\n 6)'
     """
+    arg_items = tuple(arg_val)
     sorted_arg_vals = (
-        list(arg_val) if any(
+        list(arg_items) if any(
             isinstance(arg_item, numbers.Number)
-            for arg_item in arg_val
-        ) else sorted(arg_val)
+            for arg_item in arg_items
+        ) else sorted(arg_items)
     )
     init_pad_string = " " * len(start_of_string_print)
-    bracket_start = '[' if isinstance(arg_val, list) else (
-        "(" if isinstance(arg_val, tuple) else "{")
-    bracket_end = ']' if isinstance(arg_val, list) else (
-        ")" if isinstance(arg_val, tuple) else "}")
-    print_arg_val = f"{bracket_start}"
-    if len(arg_val) > 0:
-        print_arg_val += f"{sorted_arg_vals[0]}"
-        for item in sorted_arg_vals[1:-1]:
-            print_arg_val += f",\n {init_pad_string}{item}"
-        print_arg_val += f",\n{init_pad_string} {sorted_arg_vals[-1]}" if len(
-            sorted_arg_vals) > 1 else ''
-    print_arg_val += f"{bracket_end}"
-    return print_arg_val
+    bracket_start, bracket_end = next(
+        (brackets for seq_type, brackets in _SEQUENCE_BRACKETS.items() if isinstance(arg_val, seq_type)), "{}"
+    )
+    print_arg_parts = [bracket_start]
+    if len(sorted_arg_vals) > 0:
+        print_arg_parts.append(f"{sorted_arg_vals[0]}")
+        print_arg_parts.extend(f",\n {init_pad_string}{item}" for item in sorted_arg_vals[1:-1])
+        if len(sorted_arg_vals) > 1:
+            print_arg_parts.append(f",\n{init_pad_string} {sorted_arg_vals[-1]}")
+    print_arg_parts.append(bracket_end)
+    return "".join(print_arg_parts)
 
 
 # Test from CLI
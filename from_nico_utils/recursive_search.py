@@ -1,20 +1,72 @@
 import os
 import argparse
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import FrozenSet, List, Tuple
 from natsort import natsorted
 from time import perf_counter
 from .convert_seconds_to_hr_min_sec import seconds_to_hrs_min_sec
 
 
+def _scan_directory(directory: str, extensions: FrozenSet[str], multi_part_extensions: Tuple[str, ...]) -> Tuple[List[str], List[str]]:
+    """Scan a single directory and return the matching files and the subdirectories found in it."""
+    matching_files, subdirectories = [], []
+    # The bound methods are looked up once, as this loop runs once per directory entry
+    add_matching_file, add_subdirectory = matching_files.append, subdirectories.append
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                entry_name = entry.name
+                _, dot, suffix = entry_name.rpartition(".")
+                if dot and suffix.lower() in extensions:
+                    add_matching_file(entry.path)
+                elif multi_part_extensions and entry_name.lower().endswith(multi_part_extensions):
+                    add_matching_file(entry.path)
+            elif entry.is_dir():
+                add_subdirectory(entry.path)
+    return matching_files, subdirectories
+
+
+def _walk_directory_levels(
+        subdirectories: List[str],
+        extensions: FrozenSet[str],
+        multi_part_extensions: Tuple[str, ...],
+        max_workers: int = 8,
+) -> List[str]:
+    """Walk directory trees level by level, scanning the directories of a level in threads when there is more than one of them."""
+    scan_directory = partial(_scan_directory, extensions=extensions, multi_part_extensions=multi_part_extensions)
+    matching_files, executor = [], None
+    try:
+        while subdirectories:
+            # The thread pool is only started once a level has several directories, so small trees are walked in the calling thread
+            if max_workers > 1 and len(subdirectories) > 1:
+                if executor is None:
+                    executor = ThreadPoolExecutor(max_workers=max_workers)
+                level_results = executor.map(scan_directory, subdirectories)
+            else:
+                level_results = map(scan_directory, subdirectories)
+            next_subdirectories = []
+            for directory_files, directory_subdirectories in level_results:
+                matching_files.extend(directory_files)
+                next_subdirectories.extend(directory_subdirectories)
+            subdirectories = next_subdirectories
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return matching_files
+
+
 # Recursive search for files with case-insensitive extension matching in a single directory
-def recursive_search(directory, extensions, recursive=True) -> List[str]:
+def recursive_search(directory, extensions, recursive=True, max_workers: int = 8) -> List[str]:
     """
     Recursively searches for files with specified extensions in a directory.
 
     Args:
         directory (str or List[str]): The directory path(s) to search for files.
-        extensions (List[str]): The file extensions to match.
+        extensions (List[str]): The file extensions to match, with or without the leading dot.
         recursive (bool, optional): Whether to search recursively in subdirectories. Defaults to True.
+        max_workers (int, optional): The maximum number of threads used to scan the subdirectories of the directory. 
+            A level of the directory tree is scanned in the calling thread if this is 1 or less, or if the level only has one directory. Defaults to 8.
 
     Returns:
         List[str]: A list of file paths matching the specified extensions.
@@ -27,14 +79,19 @@ def recursive_search(directory, extensions, recursive=True) -> List[str]:
         if len(directory) > 1:
             raise ValueError("The recursive search function only accepts a single directory path!")
         directory = directory[0]
-    matching_files = []
+    if not isinstance(extensions, frozenset):
+        extensions = frozenset((ext[1:] if ext.startswith(".") else ext).lower() for ext in extensions)
+    # Extensions such as "tar.gz" can't be matched on the last suffix alone, so they are matched with endswith on a tuple built once
+    multi_part_extensions = tuple(f".{ext}" for ext in extensions if "." in ext)
+
+    # Scan the top level directory, which gives the subdirectories that the rest of the walk is split on
+    matching_files, subdirectories = _scan_directory(directory, extensions, multi_part_extensions)
+    if not recursive:
+        return matching_files
 
-    # Iterate through the directory and its subdirectories if recursive is True
-    for entry in os.scandir(directory):
-        if entry.is_dir() and recursive:
-            matching_files.extend(recursive_search(entry.path, extensions))
-        elif entry.is_file() and entry.name.lower().endswith(tuple(extensions)):
-            matching_files.append(entry.path)
+    # Walk the tree level by level, scanning the directories of a level in threads, as the directory listing syscalls release the GIL.
+    # The walk order is the same whether threads are used or not, so the worker count does not reorder unsorted results
+    matching_files.extend(_walk_directory_levels(subdirectories, extensions, multi_part_extensions, max_workers=max_workers))
 
     return matching_files
 
@@ -48,6 +105,8 @@ def search_files(
         return_unique_basenames_only: bool = False,
         verbose: bool = False,
         sort_files: bool = False,
+        natural: bool = True,
+        max_workers: int = 8,
         **kwargs
 ) -> List[str]:
     """
@@ -61,6 +120,8 @@ def search_files(
         return_unique_basenames_only (bool, optional):  Whether to return only unique basenames. Defaults to False.
         verbose (bool, optional):                       Whether to print additional information. Defaults to False.
         sort_files (bool, optional):                    Whether to sort the file paths. Defaults to False.
+        natural (bool, optional):                       Whether to use natural sorting (natsort) rather than plain lexicographic sorting. Defaults to True.
+        max_workers (int, optional):                    The maximum number of threads used to walk the subdirectories. Defaults to 8.
         **kwargs:                                       Additional keyword arguments.
 
     Returns:
@@ -73,11 +134,12 @@ def search_files(
         - If the user does not specify any accepted image extensions, the default extensions ["jpg", "jpeg", "png"] will be used.
         - The start_path argument can be a single directory path or a list of directory paths.
         - The search is case-insensitive for file extensions.
-        - If return_unique_basenames_only is True, only the unique basenames of the files will be returned.
+        - If return_unique_basenames_only is True, only the first found file for each unique basename will be returned.
         - If sort_files is True, the file paths will be sorted according to the chosen sorting method.
         - If sort_by_basename is True and return_unique_basenames_only is False, the files will be sorted by their basenames.
         - If verbose is True, additional timing information for each individual process will be printed during the search process.
         - If the user specifies sort_by_basename, we will force sort_files to be True.
+        - If natural is False, the builtin sorted is used, which is considerably faster for large file lists.
 
     Examples:
         >>> search_files("/path/to/directory")
@@ -93,9 +155,10 @@ def search_files(
         start_path = [start_path]
 
     # Iterating through each of the provided directories where we want to detect files and check if they are actually existing directories
+    image_datasets_root = os.getenv("IMAGE_DATASETS", "Image_Datasets")
     for path_idx, path_val in enumerate(start_path):
         if not os.path.exists(path_val) and "Image_Datasets" in path_val:
-            start_path[path_idx] = f"{os.getenv('IMAGE_DATASETS', 'Image_Datasets')}{path_val.split('Image_Datasets')[-1]}"
+            start_path[path_idx] = f"{image_datasets_root}{path_val.split('Image_Datasets')[-1]}"
         if not os.path.isdir(start_path[path_idx]):
             raise NotADirectoryError(
                 f"The path(s) provided has to exist! Now the {path_idx + 1:d}. provided path does NOT exist => {start_path[path_idx]=}")
@@ -105,11 +168,11 @@ def search_files(
         accepted_img_extensions = [accepted_img_extensions]
     accepted_img_extensions = {ext[1:] if ext.startswith(
         ".") else ext for ext in accepted_img_extensions}
-    accepted_img_extensions = {ext.lower() for ext in accepted_img_extensions}
+    accepted_img_extensions = frozenset(ext.lower() for ext in accepted_img_extensions)
 
     # Perform the search
     t1 = perf_counter()
-    filename_list = recursive_search(start_path, accepted_img_extensions, recursive=recursive)
+    filename_list = recursive_search(start_path, accepted_img_extensions, recursive=recursive, max_workers=max_workers)
     if verbose:
         print_time_spent(time_spent=perf_counter() - t1,
                          init_print_str='Time to search for files took ')
@@ -117,7 +180,10 @@ def search_files(
     # Return only unique basenames if specified
     if return_unique_basenames_only:
         t1 = perf_counter()
-        filename_list = list({os.path.basename(x): x for x in filename_list}.values())
+        unique_basename_files = {}
+        for filepath in filename_list:
+            unique_basename_files.setdefault(filepath.rpartition(os.sep)[2], filepath)
+        filename_list = list(unique_basename_files.values())
         if verbose:
             print_time_spent(time_spent=perf_counter() - t1,
                              init_print_str='Time to retrieve only unique basenames took ')
@@ -126,7 +192,8 @@ def search_files(
     if sort_files:
         t1 = perf_counter()
         sort_func = os.path.basename if sort_by_basename and not return_unique_basenames_only else str
-        filename_list = natsorted(filename_list, key=lambda x: sort_func(x).lower())
+        sort_method = natsorted if natural else sorted
+        filename_list = sort_method(filename_list, key=lambda filepath: sort_func(filepath).lower())
         if verbose:
             print_time_spent(time_spent=perf_counter() - t1,
                              init_print_str='Time to sort the file paths took ')
@@ -162,6 +229,10 @@ if __name__ == "__main__":
                         help="If True, print out the time spent on each process. Defaults to False.")
     parser.add_argument("--sort_files", type=str2bool, default=False,
                         help="If True, sort the file paths. Defaults to False.")
+    parser.add_argument("--natural", type=str2bool, default=True,
+                        help="If True, use natural sorting when sorting the file paths. Defaults to True.")
+    parser.add_argument("--max_workers", type=int, default=8,
+                        help="The maximum number of threads used to walk the subdirectories. Defaults to 8.")
     args = parser.parse_args()
 
     # Display the chosen arguments
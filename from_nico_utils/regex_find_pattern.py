@@ -1,20 +1,42 @@
 from datetime import datetime
-from typing import Union, Dict, Tuple
+from functools import lru_cache
+from typing import Union, Dict, Optional, Tuple
 import re 
 
+@lru_cache(maxsize=None)
+def _compile_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """Compile a regex pattern once and reuse the compiled object on subsequent calls."""
+    return re.compile(pattern=pattern, flags=flags)
+
+
+def _findall_value(match: re.Match) -> Union[str, Tuple[str, ...]]:
+    """Return the value re.findall gives for a match, i.e. the whole match, the only group, or a tuple of all groups."""
+    groups = match.groups(default="")
+    if not groups:
+        return match.group(0)
+    return groups[0] if len(groups) == 1 else groups
+
+
 def regex_find_pattern(
         inp_string: str,
-        pattern: str,
+        pattern: Union[str, re.Pattern],
         get_first: bool = False,
-        ignore_case: bool = True
+        ignore_case: bool = False
 ) -> Union[str, None]:
     """
     Find a pattern in a string using regex
     """
     if isinstance(pattern, str):
-        re.compile(pattern=pattern, flags=re.IGNORECASE if ignore_case else 0)
-    match = re.findall(pattern, inp_string)
-    return match[0 if get_first else -1] if match else None
+        pattern = _compile_pattern(pattern, re.IGNORECASE if ignore_case else 0)
+    if get_first:
+        match = pattern.search(inp_string)
+        return _findall_value(match) if match else None
+
+    # Only keep a reference to the latest match, instead of building the list of all matches
+    match = None
+    for match in pattern.finditer(inp_string):
+        pass
+    return _findall_value(match) if match else None
 
 
 def date_formats2pattern() -> Dict[str, str]:
@@ -42,14 +64,32 @@ def date_formats2pattern() -> Dict[str, str]:
     }
 
 
+@lru_cache(maxsize=None)
+def _compile_date_formats(date_format_items: Tuple[Tuple[str, str], ...]) -> Tuple[Tuple[Tuple[str, re.Pattern], ...], re.Pattern]:
+    """Compile each date pattern on its own and combined into a single alternation with one named group per format."""
+    compiled_formats = tuple(
+        (date_format, _compile_pattern(date_pattern)) for date_format, date_pattern in date_format_items
+    )
+    combined_pattern = _compile_pattern(
+        "|".join(f"(?P<fmt{fmt_idx}>{date_pattern})" for fmt_idx, (_, date_pattern) in enumerate(date_format_items))
+    )
+    return compiled_formats, combined_pattern
+
+
+# The default date formats compiled once at import time, so parsing a string does not rebuild or recompile them
+_DEFAULT_DATE_FORMATS = _compile_date_formats(tuple(date_formats2pattern().items()))
+
+
 def datetime_from_string(
         inp_string: str,
-        date_formats: Dict = date_formats2pattern()
+        date_formats: Optional[Dict] = None
 ) -> Tuple[datetime, str]:
     """Extract a datetime object and the remaining string from an input string.
 
     This function searches the input string for a date that matches any of the provided 
     formats, returning the first found datetime and the string with the date removed.
+    The formats are tried in the order of the dictionary, i.e. the first format that matches 
+    anywhere in the string is used.
 
     Args:
         inp_string (str): The input string containing a date.
@@ -60,11 +100,25 @@ def datetime_from_string(
         tuple: A tuple containing the extracted datetime object and the remaining string 
                after the date has been removed.
     """
-    string_wo_time = inp_string
-    for start_date_format, start_date_pattern in date_formats.items():
-        start_time = regex_find_pattern(inp_string=inp_string, pattern=start_date_pattern, get_first=True)
-        if start_time:
-            string_wo_time = inp_string.replace(start_time, "")
-            start_time = datetime.strptime(start_time, start_date_format)
+    if date_formats is None:
+        compiled_formats, combined_pattern = _DEFAULT_DATE_FORMATS
+    elif not date_formats:
+        return None, inp_string
+    else:
+        compiled_formats, combined_pattern = _compile_date_formats(tuple(date_formats.items()))
+
+    # A single scan with the combined pattern finds the leftmost date and tells which format it matched
+    match = combined_pattern.search(inp_string)
+    if match is None:
+        return None, inp_string
+    fmt_idx = int(match.lastgroup[len("fmt"):])
+
+    # A format with a higher priority can only match further to the right, so only those are searched from there
+    for higher_fmt_idx in range(fmt_idx):
+        higher_match = compiled_formats[higher_fmt_idx][1].search(inp_string, match.start() + 1)
+        if higher_match:
+            match, fmt_idx = higher_match, higher_fmt_idx
             break
-    return start_time, string_wo_time
+
+    date_string = match.group(0)
+    return datetime.strptime(date_string, compiled_formats[fmt_idx][0]), inp_string.replace(date_string, "")
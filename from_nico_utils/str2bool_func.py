@@ -2,6 +2,10 @@ import argparse
 import sys
 sys.dont_write_bytecode = True
 
+# The accepted string representations of True and False, built once at import time
+_TRUE_STRINGS = frozenset(("yes", "y", "true", "t", "1"))
+_FALSE_STRINGS = frozenset(("no", "n", "false", "f", "0", "none"))
+
 
 # Define a function to convert a string into a boolean value
 def str2bool(string: str) -> bool:
@@ -35,9 +39,10 @@ def str2bool(string: str) -> bool:
     """
     if isinstance(string, bool):
         return string
-    if str(string).lower().strip() in ["yes", "y", "true", "t", "1"]:
+    lowered_string = (string if isinstance(string, str) else str(string)).lower().strip()
+    if lowered_string in _TRUE_STRINGS:
         return True
-    elif str(string).lower().strip() in ["no", "n", "false", "f", "0", "none"]:
+    elif lowered_string in _FALSE_STRINGS:
         return False
     else:
         raise argparse.ArgumentTypeError(
@@ -1,9 +1,12 @@
 from from_nico_utils.recursive_search import search_files
-from from_nico_utils.regex_find_pattern import datetime_from_string
-from typing import Union
+from from_nico_utils.regex_find_pattern import date_formats2pattern
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Union
 from pathlib import Path
 from datetime import datetime
+from tqdm import tqdm
 import polars as pl
+import os
 
 
 def read_auction_files(
@@ -13,7 +16,7 @@ def read_auction_files(
 
     This function scans the given directory for auction result files, extracts relevant 
     information such as region, IDA group, and dates, and returns a structured DataFrame 
-    containing this data.
+    containing this data. Only one file is kept per delivery date, region, and IDA group.
 
     Args:
         aution_data_dir (Union[str, Path]): The directory path containing auction result files.
@@ -29,21 +32,26 @@ def read_auction_files(
         "filepath": auction_result_files
     })
     
-    # Map the files into the region and IDA group
-    auction_results_df = auction_results_df.with_columns(
-        pl.col("filepath").map_elements(lambda x: "DK1" if "DK1" in x else "DK2", return_dtype=pl.String).alias("Region")
-    )
-    auction_results_df = auction_results_df.with_columns(
-        pl.col("filepath").map_elements(
-            lambda x: "IDA1" if "IDA1" in x else "IDA2" if "IDA2" in x else "IDA3", return_dtype=pl.String,
-        ).alias("IDA Group")
-    )
+    # Map the files into the region and IDA group - native string expressions, so no Python function is called per row
+    auction_results_df = auction_results_df.with_columns([
+        pl.when(pl.col("filepath").str.contains("DK1", literal=True)).then(pl.lit("DK1"))
+        .otherwise(pl.lit("DK2")).alias("Region"),
+        pl.when(pl.col("filepath").str.contains("IDA1", literal=True)).then(pl.lit("IDA1"))
+        .when(pl.col("filepath").str.contains("IDA2", literal=True)).then(pl.lit("IDA2"))
+        .otherwise(pl.lit("IDA3")).alias("IDA Group"),
+    ])
 
-    # Extract the datetime values from the filepaths -> this auction_date is None/Null for all rows ... 
-    auction_results_df = auction_results_df.with_columns(
-        pl.col("filepath").map_elements(lambda x: datetime_from_string(x)[0], return_dtype=pl.Datetime).dt.date()
-        .alias("filepath_written_date")
-    )
+    # Extract the datetime values from the filepaths. The date formats are tried in the same order as in datetime_from_string,
+    # i.e. the first format found anywhere in the filepath is used. Only that format is parsed, so a filepath where the first
+    # found date is invalid becomes null, instead of falling back to a lower priority format. Filepaths without a date also become null
+    written_dates, no_earlier_date_found = [], pl.lit(True)
+    for date_format, date_pattern in date_formats2pattern().items():
+        extracted_date = pl.col("filepath").str.extract(f"({date_pattern})", 1)
+        written_dates.append(
+            pl.when(no_earlier_date_found).then(extracted_date.str.strptime(pl.Datetime, format=date_format, strict=False))
+        )
+        no_earlier_date_found = no_earlier_date_found & extracted_date.is_null()
+    auction_results_df = auction_results_df.with_columns(pl.coalesce(written_dates).dt.date().alias("filepath_written_date"))
     # The relevant delivery_date is +1 day for IDA1 and IDA2, not for any other IDA group. Add timedelta(1) for IDA1 and IDA2 and name that new column delivery_date
     auction_results_df = auction_results_df.with_columns(
         pl.when(pl.col("IDA Group").is_in(["IDA1", "IDA2"]))
@@ -52,7 +60,11 @@ def read_auction_files(
         .alias("delivery_date")
     )
     auction_results_df = auction_results_df.drop_nulls()
-    auction_results_df = auction_results_df.sort("delivery_date", descending=False)
+
+    # Keep a single file per delivery date, region, and IDA group, so reruns or backups of an auction are only read once.
+    # The files are sorted by their path first, so the last path in sorted order is the one kept
+    auction_results_df = auction_results_df.sort(["delivery_date", "filepath"], descending=False)
+    auction_results_df = auction_results_df.unique(subset=["delivery_date", "Region", "IDA Group"], keep="last", maintain_order=True)
     return auction_results_df
 
 
@@ -74,10 +86,9 @@ def read_single_auction_file(auction_filepath: Union[str, Path], IDA_group: str,
         pl.DataFrame: A DataFrame containing the hourly average auction prices for the specified region.
     """
 
-    # Read the auction data
-    auction_df = pl.read_excel(auction_filepath)
+    # Read the auction data - only the quarter time and price columns are parsed from the file
+    auction_df = pl.read_excel(auction_filepath, engine="calamine", columns=["Type", "Schedule"])
     auction_df = auction_df.drop_nulls()
-    auction_df = auction_df.drop([col for col in auction_df.columns if "unnamed" in col.lower()])
     auction_df = auction_df.rename({"Type": "Quater_Time", "Schedule": "Area_Price"})
 
     # Convert the quater time into a datetime object
@@ -105,3 +116,53 @@ def read_single_auction_file(auction_filepath: Union[str, Path], IDA_group: str,
     hourly_averages_df = hourly_averages_df.sort("Start_Time", descending=False).drop(["Hour", "Date"])
     return hourly_averages_df.rename({"Area_Price_Hour": f"Auction_Price_{region}"})
 
+
+
+def read_hourly_auction_prices(auctions_df: pl.DataFrame, max_workers: Optional[int] = None) -> pl.DataFrame:
+    """Read the hourly average prices of all the given auction files into a single DataFrame.
+
+    This function reads each auction file listed in the auction DataFrame (as returned by read_auction_files) 
+    and stacks the hourly average prices into one long DataFrame, with one row per auction file and hour. 
+    Each auction is identified by its row index in the auction DataFrame, so an auction file listed twice 
+    gets its own hourly prices for each of its rows. The files are read concurrently in a thread pool, 
+    as the Excel parsing releases the GIL.
+
+    Args:
+        auctions_df (pl.DataFrame): A DataFrame with the 'filepath', 'IDA Group', 'delivery_date', and 'Region' 
+            columns of the auction files to read.
+        max_workers (Optional[int], optional): The number of threads used to read the files. 
+            Defaults to None, i.e. the number of CPUs.
+
+    Returns:
+        pl.DataFrame: A DataFrame with the columns 'Auction_Index', 'Auction_Filepath', 'Start_Time', and 'Auction_Price'.
+    """
+
+    filepaths, ida_groups, delivery_dates, regions = (
+        auctions_df[col].to_list() for col in ["filepath", "IDA Group", "delivery_date", "Region"]
+    )
+    hourly_price_dfs = [None] * len(filepaths)
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(
+                read_single_auction_file,
+                auction_filepath=filepath,
+                IDA_group=ida_group,
+                date=delivery_date,
+                region=region,
+            ): auction_idx
+            for auction_idx, (filepath, ida_group, delivery_date, region) in enumerate(zip(filepaths, ida_groups, delivery_dates, regions))
+        }
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Reading auction files", leave=True):
+            auction_idx = futures[future]
+
+            # Give the price column a region independent name, so all files can be stacked
+            hourly_price_dfs[auction_idx] = future.result().select([
+                pl.lit(auction_idx, dtype=pl.UInt32).alias("Auction_Index"),
+                pl.lit(filepaths[auction_idx]).alias("Auction_Filepath"),
+                pl.col("Start_Time"),
+                pl.col(f"Auction_Price_{regions[auction_idx]}").alias("Auction_Price"),
+            ])
+
+    if not hourly_price_dfs:
+        return pl.DataFrame(schema={"Auction_Index": pl.UInt32, "Auction_Filepath": pl.String, "Start_Time": pl.Datetime, "Auction_Price": pl.Float64})
+    return pl.concat(hourly_price_dfs, how="vertical")
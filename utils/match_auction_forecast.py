@@ -1,130 +1,151 @@
 from utils.read_forecast_data import read_forecast_df
-from utils.auction_related_functions import read_auction_files, read_single_auction_file
-from datetime import timedelta
+from utils.auction_related_functions import read_auction_files, read_hourly_auction_prices
 from typing import Union, List
 from pathlib import Path
-from tqdm import tqdm
 import polars as pl
 
+# The hour of the day at which the forecasts used for each IDA group are made
+IDA_GROUP_PTIME_HOURS = {"IDA1": 15, "IDA2": 22, "IDA3": 10}
+
 
 def merge_forecast_and_auction_dataframes(
-        forecast_auction_mathces: List[pl.DataFrame]
-) -> pl.DataFrame:
+        forecast_auction_mathces: Union[pl.DataFrame, List[pl.DataFrame]]
+) -> pl.LazyFrame:
     """Merge multiple forecast and auction DataFrames into a single DataFrame.
 
-    This function takes a list of DataFrames containing forecast and auction matches, 
-    concatenates them, and filters the results to create a comprehensive DataFrame 
+    This function takes the forecast and auction matches, either as a single DataFrame or a list of DataFrames 
+    which are concatenated, and filters the results to create a comprehensive DataFrame 
     that includes relevant auction prices while removing any rows with all null auction values.
 
     Args:
-        forecast_auction_mathces (List[pl.DataFrame]): A list of DataFrames to be merged.
+        forecast_auction_mathces (Union[pl.DataFrame, List[pl.DataFrame]]): The DataFrame, or a list of DataFrames, to be merged.
 
     Returns:
-        pl.DataFrame: A single DataFrame containing the merged forecast and auction data.
+        pl.LazyFrame: A single LazyFrame containing the merged forecast and auction data.
     """
 
-    # Merge all the forecast-auction matches into a single, large dataframe
-    tmp_df, merged_forecast_auction_df = pl.DataFrame(), pl.DataFrame()
-    for df in tqdm(forecast_auction_mathces):
-        tmp_df = pl.concat([tmp_df, df], how="diagonal")
-    time_filtering_prog_bar = tqdm(enumerate(tmp_df["Time"].unique()), leave=True, total=tmp_df["Time"].n_unique())
-    tmp_df = tmp_df.sort("Time", descending=False)
-    for time_idx, time in time_filtering_prog_bar:
-        time_filtering_prog_bar.set_description(f"Filtering time {time_idx+1}/{len(time_filtering_prog_bar)}")
-        time_df = tmp_df.filter(pl.col("Time") == pl.lit(time))
-        for col in [col for col in time_df.columns if "price" in col.lower() and "forecast" not in col.lower()]:
-            vals = time_df[col].to_list()
-            vals_no_nulls = [val for val in vals if val is not None]
-            vals_no_nulls += [None] * (len(vals) - len(vals_no_nulls))
-            time_df = time_df.with_columns(pl.Series(col, vals_no_nulls))
-        merged_forecast_auction_df = pl.concat([merged_forecast_auction_df, time_df])
+    # Merge all the forecast-auction matches into a single, large dataframe - concatenated in one call, not one frame at a time
+    if isinstance(forecast_auction_mathces, pl.DataFrame):
+        tmp_df = forecast_auction_mathces
+    else:
+        tmp_df = pl.concat(forecast_auction_mathces, how="diagonal")
+    merged_forecast_auction_lf = tmp_df.lazy().sort("Time", descending=False, maintain_order=True)
+
+    # Within each time, move the non-null auction prices to the top rows of each auction price column, keeping their order
+    auction_price_cols = [col for col in tmp_df.columns if "price" in col.lower() and "forecast" not in col.lower()]
+    merged_forecast_auction_lf = merged_forecast_auction_lf.with_columns([
+        pl.col(col).sort_by(pl.col(col).is_null(), maintain_order=True).over("Time") for col in auction_price_cols
+    ])
     
     # Remove any rows where all auction values are None 
-    merged_forecast_auction_df = merged_forecast_auction_df.filter(
+    merged_forecast_auction_lf = merged_forecast_auction_lf.filter(
         ~(pl.col("Auction_Price_DK1").is_null() & pl.col("Auction_Price_DK2").is_null())
     )
-    merged_forecast_auction_df = merged_forecast_auction_df.sort("Time", descending=False)
-    return merged_forecast_auction_df
+    merged_forecast_auction_lf = merged_forecast_auction_lf.sort("Time", descending=False, maintain_order=True)
+    return merged_forecast_auction_lf
 
 
 def match_auction_with_forecast(
-    forecast_df_or_path: Union[str, Path, pl.DataFrame],
-    auction_df_or_dir: Union[str, Path, pl.DataFrame]
-) -> None:
+    forecast_df_or_path: Union[str, Path, pl.DataFrame, pl.LazyFrame],
+    auction_df_or_dir: Union[str, Path, pl.DataFrame, pl.LazyFrame]
+) -> pl.DataFrame:
     """Match auction data with corresponding forecast data.
 
     This function reads auction and forecast data from specified sources, filters the auction 
     data to include only those with corresponding forecasts, and merges the relevant data 
-    into a list of DataFrames for further analysis.
+    into a single DataFrame for further analysis. The matching is built as one lazy query, 
+    i.e. the forecast data is joined with all auctions at once instead of being filtered once per auction.
+
+    For each auction, the relevant forecasts are those made at the hour of the day matching the IDA group 
+    (15 for IDA1, 22 for IDA2, 10 for IDA3) on the delivery date or the day before, with a forecast 
+    'Time' within the hours of the auction.
 
     Args:
-        forecast_df_or_path (Union[str, Path, pl.DataFrame]): The path to the forecast data file 
-            or a DataFrame containing the forecast data.
-        auction_df_or_dir (Union[str, Path, pl.DataFrame]): The path to the auction data directory 
-            or a DataFrame containing the auction data.
+        forecast_df_or_path (Union[str, Path, pl.DataFrame, pl.LazyFrame]): The path to the forecast data file 
+            or a DataFrame/LazyFrame containing the forecast data.
+        auction_df_or_dir (Union[str, Path, pl.DataFrame, pl.LazyFrame]): The path to the auction data directory 
+            or a DataFrame/LazyFrame containing the auction data.
 
     Raises:
         ValueError: If no forecasts or relevant forecasts are found for an auction.
+
+    Returns:
+        pl.DataFrame: A DataFrame with one row per matched forecast and auction, with the forecast columns, 
+            'Auction_Price_DK1', 'Auction_Price_DK2' (null for the region the auction does not belong to), 
+            'IDA Group', 'Region', and 'Auction_Filepath'.
     """
 
     # Read the data
     forecast_df = read_forecast_df(forecast_path=forecast_df_or_path) if isinstance(forecast_df_or_path, str) else forecast_df_or_path
     all_auctions_df = read_auction_files(aution_data_dir=auction_df_or_dir) if isinstance(auction_df_or_dir, str) else auction_df_or_dir
+    # A lazy forecast input is materialised once, as it is referenced by both the auction filtering and the matching query
+    forecast_lf = (forecast_df.collect() if isinstance(forecast_df, pl.LazyFrame) else forecast_df).lazy()
+    forecast_columns = forecast_lf.collect_schema().names()
     
     # Remove auction data that does not have a corresponding forecast
-    all_auctions_df = all_auctions_df.filter(pl.col("delivery_date").is_in(forecast_df["Time"].dt.date()))
-    all_auctions_df = all_auctions_df.sort(["delivery_date", "Region", "IDA Group"], descending=False)
-
-    # Loop through each auction file 
-    forecast_auction_mathces = []
-    auction_row_dicts = all_auctions_df.to_dicts()
-    dict_prog_bar = tqdm(enumerate(auction_row_dicts), total=len(auction_row_dicts), desc="Reading auction files", leave=True)
-    for auction_idx, auction_dict in dict_prog_bar:
-        ida_group = auction_dict.get("IDA Group")
-        delivery_date = auction_dict.get("delivery_date")
-        region = auction_dict.get("Region")
-        dict_prog_bar.set_description(f"Reading auction file {auction_idx+1}/{len(auction_row_dicts)}. IDA Group: {ida_group}, Region: {region}, Delivery Date: {delivery_date.strftime('%d-%b-%Y')}")
-        
-        # Read the auction data
-        auction_df = read_single_auction_file(auction_filepath=auction_dict.get("filepath"), IDA_group=ida_group, date=delivery_date, region=region)
-        auction_start_time = auction_df["Start_Time"].min()
-        auction_end_time = auction_df["Start_Time"].max()
-        day_before_delivery = delivery_date - timedelta(days=1)  # Get the day before the delivery date
-
-        # Read the corresponding forecast data for the auction
-        ptime_hour_needed = 15 if ida_group == "IDA1" else (22 if ida_group == "IDA2" else 10)
-        forecasts_for_auction = forecast_df.filter(
-            (pl.col("PTime").dt.date() == pl.lit(delivery_date)) | 
-            (pl.col("PTime").dt.date() == pl.lit(day_before_delivery))
-        ).filter((pl.col("PTime").dt.hour() == ptime_hour_needed))
-        forecasts_for_auction = forecasts_for_auction.sort("Time", descending=False)
-        
-        # Empty forecasts will only happen on occasions, where there are actually no forecasts in the forecast data
-        if forecasts_for_auction.height == 0:
+    forecast_dates_lf = forecast_lf.select(pl.col("Time").dt.date().alias("delivery_date")).unique()
+    all_auctions_df = all_auctions_df.lazy().join(forecast_dates_lf, on="delivery_date", how="semi")
+    all_auctions_df = all_auctions_df.sort(["delivery_date", "Region", "IDA Group"], descending=False).collect()
+    all_auctions_df = all_auctions_df.with_row_index("Auction_Index")
+
+    # Read the hourly prices of all auction files, and the hours each of the auctions cover. The auctions are keyed on their
+    # index, as the same filepath can be listed more than once in a given auctions DataFrame
+    auction_prices_lf = read_hourly_auction_prices(auctions_df=all_auctions_df).lazy()
+    auction_hours_lf = auction_prices_lf.group_by("Auction_Index").agg([
+        pl.col("Start_Time").min().alias("Auction_Start_Time"),
+        pl.col("Start_Time").max().alias("Auction_End_Time"),
+    ])
+
+    # Each auction uses the forecasts made at the IDA group specific hour, on either the delivery date or the day before
+    auctions_lf = all_auctions_df.lazy().with_columns(
+        pl.col("IDA Group").replace_strict(IDA_GROUP_PTIME_HOURS, default=IDA_GROUP_PTIME_HOURS["IDA3"], return_dtype=pl.Int8)
+        .alias("PTime_Hour"),
+        pl.concat_list([pl.col("delivery_date"), pl.col("delivery_date") - pl.duration(days=1)]).alias("PTime_Date"),
+    ).explode("PTime_Date")
+    # The forecasts are keyed on (PTime date, PTime hour) for a single hash join. Forecasts made at
+    # any other hour than the IDA group hours can never match an auction, so they are dropped before the join
+    forecasts_by_ptime_lf = forecast_lf.with_columns([
+        pl.col("PTime").dt.date().alias("PTime_Date"),
+        pl.col("PTime").dt.hour().cast(pl.Int8).alias("PTime_Hour"),
+    ]).filter(pl.col("PTime_Hour").is_in(list(set(IDA_GROUP_PTIME_HOURS.values()))))
+    forecasts_for_auctions_lf = auctions_lf.join(forecasts_by_ptime_lf, on=["PTime_Date", "PTime_Hour"], how="inner")
+
+    # As the auction data last for either 12 or 24 hours, we will only consider the forecast data for the same time period
+    forecasts_for_auctions_lf = forecasts_for_auctions_lf.join(
+        auction_hours_lf, on="Auction_Index", how="left"
+    ).with_columns(
+        pl.col("Time").is_between(pl.col("Auction_Start_Time"), pl.col("Auction_End_Time")).fill_null(False).alias("Is_Relevant")
+    ).cache()
+
+    ### Now, we need to merge this data together - use a left join to retain all the relevant forecasts
+    matches_lf = forecasts_for_auctions_lf.filter(pl.col("Is_Relevant")).join(
+        auction_prices_lf,
+        left_on=["Auction_Index", "Time"],
+        right_on=["Auction_Index", "Start_Time"],
+        how="left",
+    ).sort(["Auction_Index", "Time", "PTime"]).select([
+        *forecast_columns,
+        *[pl.when(pl.col("Region") == region).then(pl.col("Auction_Price")).alias(f"Auction_Price_{region}") for region in ["DK1", "DK2"]],
+        pl.col("IDA Group"),
+        pl.col("Region"),
+        pl.col("filepath").alias("Auction_Filepath"),
+    ])
+    match_counts_lf = forecasts_for_auctions_lf.group_by("Auction_Index").agg([
+        pl.len().alias("Forecast_Count"),
+        pl.col("Is_Relevant").sum().alias("Relevant_Forecast_Count"),
+    ])
+    forecast_auction_matches, match_counts = pl.collect_all([matches_lf, match_counts_lf])
+
+    # Empty forecasts will only happen on occasions, where there are actually no forecasts in the forecast data
+    match_counts = all_auctions_df.join(match_counts, on="Auction_Index", how="left", maintain_order="left").fill_null(0)
+    auctions_without_matches = match_counts.filter((pl.col("Forecast_Count") == 0) | (pl.col("Relevant_Forecast_Count") == 0))
+    if auctions_without_matches.height:
+        auction_dict = auctions_without_matches.row(0, named=True)
+        forecast_count = auction_dict.pop("Forecast_Count")
+        auction_dict.pop("Relevant_Forecast_Count")
+        auction_dict.pop("Auction_Index")
+        if forecast_count == 0:
             raise ValueError(f"No forecasts found for auction: {auction_dict}!")
+        raise ValueError(f"No relevant forecasts found for auction: {auction_dict}!")
 
-        # As the auction data last for either 12 or 24 hours, we will only consider the forecast data for the same time period
-        relevant_forecasts = forecasts_for_auction.filter(
-            (pl.col("Time") >= auction_start_time) & (pl.col("Time") <= auction_end_time)
-        )
-        if relevant_forecasts.height == 0:
-            raise ValueError(f"No relevant forecasts found for auction: {auction_dict}!")
-        auction_df_relevant = auction_df.filter(
-            (pl.col("Start_Time") >= relevant_forecasts["Time"].min()) & 
-            (pl.col("Start_Time") <= relevant_forecasts["Time"].max())
-        )
-
-        ### Now, we need to merge this data together
-        joined_df = relevant_forecasts.join(
-            auction_df_relevant, 
-            left_on="Time", 
-            right_on="Start_Time", 
-            how="left"  # Use left join to retain all rows from relevant_forecasts
-        )
-        joined_df = joined_df.with_columns([
-            pl.lit(ida_group).alias("IDA Group"),
-            pl.lit(region).alias("Region"),
-            pl.lit(auction_dict.get("filepath")).alias("Auction_Filepath"),
-        ])
-        forecast_auction_mathces.append(joined_df)
-    return forecast_auction_mathces
\ No newline at end of file
+    return forecast_auction_matches
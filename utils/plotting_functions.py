@@ -1,9 +1,17 @@
+import matplotlib
+matplotlib.use("Agg")                               # The plots are only saved to files, so use the non-interactive backend
 from matplotlib import pyplot as plt
 from typing import Union
 from pathlib import Path
 import polars as pl
+import numpy as np
 import os
 
+# The columns used by the plots, i.e. the only columns extracted from the data when plotting
+PLOT_COLUMNS = [
+    "Time", "Auction_Price_DK1", "Auction_Price_DK2", "DK1_forecast_price", "DK2_forecast_price", "Price_Diff_DK1", "Price_Diff_DK2",
+]
+
 
 def plot_price_diff_dist(
         pl_data: pl.DataFrame,
@@ -25,9 +33,10 @@ def plot_price_diff_dist(
 
     fig = plt.figure(figsize=(12, 6))
 
-    # Subplot for DK1
+    # Subplot for DK1 - the histogram is computed with numpy and drawn as bars
     plt.subplot(1, 2, 1)
-    plt.hist(pl_data['Price_Diff_DK1'], bins=30, color='blue', edgecolor='black')
+    counts, bin_edges = np.histogram(pl_data['Price_Diff_DK1'].drop_nulls().drop_nans().to_numpy(), bins=30)
+    plt.bar(bin_edges[:-1], counts, width=np.diff(bin_edges), align='edge', color='blue', edgecolor='black')
     plt.title('Price Difference Distribution for DK1')
     plt.grid(True)
     plt.xlabel('Price Difference (DK1)')
@@ -35,7 +44,8 @@ def plot_price_diff_dist(
 
     # Subplot for DK2
     plt.subplot(1, 2, 2)
-    plt.hist(pl_data['Price_Diff_DK2'], bins=30, color='green', edgecolor='black')
+    counts, bin_edges = np.histogram(pl_data['Price_Diff_DK2'].drop_nulls().drop_nans().to_numpy(), bins=30)
+    plt.bar(bin_edges[:-1], counts, width=np.diff(bin_edges), align='edge', color='green', edgecolor='black')
     plt.title('Price Difference Distribution for DK2')
     plt.grid(True)
     plt.xlabel('Price Difference (DK2)')
@@ -69,13 +79,18 @@ def plot_prices_and_diffs(
         None
     """
 
+    # Extract each plotted column as a numpy array once, instead of letting matplotlib convert the Series on every call.
+    # Nulls in the float columns become NaN, which matplotlib leaves as gaps just as before
+    plot_arrays = {col: pl_data[col].to_numpy() for col in PLOT_COLUMNS}
+    time_arr = plot_arrays["Time"]
+
     # Create a new figure with 2 subplots (one for DK1, one for DK2)
     fig, axes = plt.subplots(2, 1, figsize=(12, 10), sharex=True)
 
     # Plot for DK1
-    axes[0].plot(pl_data['Time'], pl_data['Auction_Price_DK1'], label='Auction Price DK1', color='blue')
-    axes[0].plot(pl_data['Time'], pl_data['DK1_forecast_price'], label='Forecasted Price DK1', color='red', linestyle=None, marker=".", markeredgecolor='red', markerfacecolor="red")
-    axes[0].bar(pl_data['Time'], pl_data['Price_Diff_DK1'], label='Price Difference DK1', color='black', alpha=0.5)
+    axes[0].plot(time_arr, plot_arrays['Auction_Price_DK1'], label='Auction Price DK1', color='blue')
+    axes[0].plot(time_arr, plot_arrays['DK1_forecast_price'], label='Forecasted Price DK1', color='red', linestyle=None, marker=".", markeredgecolor='red', markerfacecolor="red")
+    axes[0].bar(time_arr, plot_arrays['Price_Diff_DK1'], label='Price Difference DK1', color='black', alpha=0.5)
 
     axes[0].set_title('DK1: Auction Price, Forecasted Price, and Price Difference')
     axes[0].set_ylabel('Price')
@@ -84,9 +99,9 @@ def plot_prices_and_diffs(
     axes[0].legend()
 
     # Plot for DK2
-    axes[1].plot(pl_data['Time'], pl_data['Auction_Price_DK2'], label='Auction Price DK2', color='blue')
-    axes[1].plot(pl_data['Time'], pl_data['DK2_forecast_price'], label='Forecasted Price DK2', color='red', linestyle='-.')
-    axes[1].bar(pl_data['Time'], pl_data['Price_Diff_DK2'], label='Price Difference DK2', color='black', alpha=0.5)
+    axes[1].plot(time_arr, plot_arrays['Auction_Price_DK2'], label='Auction Price DK2', color='blue')
+    axes[1].plot(time_arr, plot_arrays['DK2_forecast_price'], label='Forecasted Price DK2', color='red', linestyle='-.')
+    axes[1].bar(time_arr, plot_arrays['Price_Diff_DK2'], label='Price Difference DK2', color='black', alpha=0.5)
 
     axes[1].set_title('DK2: Auction Price, Forecasted Price, and Price Difference')
     axes[1].set_xlabel('Time')
@@ -4,6 +4,9 @@ from pathlib import Path
 import polars as pl
 import os
 
+# The forecast price columns in the raw csv file and the names they are given when read
+FORECAST_PRICE_COLUMNS = {"cor_pe_RegPrice.DK1": "DK1_forecast_price", "cor_pe_RegPrice.DK2": "DK2_forecast_price"}
+FORECAST_SCHEMA_OVERRIDES = {"PTime": pl.Datetime, "Time": pl.Datetime, **{col: pl.Float64 for col in FORECAST_PRICE_COLUMNS}}
 
 def read_forecast_df(
         forecast_path: Union[str, Path],
@@ -13,6 +16,7 @@ def read_forecast_df(
 
     This function loads forecast data from the specified file path, cleans the data by removing 
     null values and invalid entries, and ensures that the time combinations are unique if specified. 
+    The file is scanned lazily with the 'PTime', 'Time', and forecast price columns parsed directly into their types. 
     The resulting DataFrame contains properly formatted datetime and price columns.
 
     Args:
@@ -34,18 +38,16 @@ def read_forecast_df(
     if not os.path.isfile(forecast_path):
         raise FileNotFoundError(f"forecast_path: {forecast_path} does not exist")
     
-    # Read the forecast data
-    forecast_df = pl.read_csv(forecast_path)
-    forecast_df = forecast_df.drop_nulls()
-    forecast_df = forecast_df.filter(~pl.any_horizontal(forecast_df.select(pl.col("*") == "NA")))
-    forecast_df = forecast_df.rename({"cor_pe_RegPrice.DK1": "DK1_forecast_price", "cor_pe_RegPrice.DK2": "DK2_forecast_price"})
-    forecast_df = forecast_df.with_columns([
-        pl.col("PTime").str.strptime(pl.Datetime, format="%Y-%m-%d %H:%M:%S"),
-        pl.col("Time").str.strptime(pl.Datetime, format="%Y-%m-%d %H:%M:%S"),
-        pl.col("DK1_forecast_price").cast(pl.Float64),
-        pl.col("DK2_forecast_price").cast(pl.Float64)
-    ])
-    forecast_df = forecast_df.sort("PTime", descending=False)
+    # Read the forecast data - the time and forecast price columns are parsed directly into their final types.
+    # The "NA" entries are read as nulls, so rows with an "NA" in any column are removed together with any other nulls
+    forecast_lf = pl.scan_csv(
+        forecast_path,
+        schema_overrides=FORECAST_SCHEMA_OVERRIDES,
+        null_values=["NA"],
+    )
+    forecast_lf = forecast_lf.drop_nulls()
+    forecast_lf = forecast_lf.rename(FORECAST_PRICE_COLUMNS)
+    forecast_df = forecast_lf.sort("PTime", descending=False).collect()
 
     # Check if the combinations of "Time" and "PTime" are unique
     if assure_unique_time_ptime_combinations:
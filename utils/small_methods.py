@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import List, Tuple, Union
 import polars as pl
 
 
@@ -6,8 +6,8 @@ def check_unique_time_ptime_combinations(df: pl.DataFrame) -> bool:
     """
     Check if all combinations of "Time" and "PTime" in the DataFrame are unique.
 
-    This function counts the unique combinations of the "Time" and "PTime" columns in the provided DataFrame
-    and compares this count to the total number of rows. It returns True if all combinations are unique, 
+    This function checks whether any combination of the "Time" and "PTime" columns in the provided DataFrame
+    is duplicated, without materialising the deduplicated frame. It returns True if all combinations are unique, 
     and False otherwise.
 
     Args:
@@ -16,20 +16,14 @@ def check_unique_time_ptime_combinations(df: pl.DataFrame) -> bool:
     Returns:
         bool: True if all combinations of "Time" and "PTime" are unique, False otherwise.
     """
-    # Count the number of unique combinations of "Time" and "PTime"
-    unique_combinations_count = df.select([pl.col("Time"), pl.col("PTime")]).unique().height
-    
-    # Compare with the total number of rows in the DataFrame
-    total_rows = df.height
-    
-    # Return True if all combinations are unique, False otherwise
-    return unique_combinations_count == total_rows
+    # Return True if no combination of "Time" and "PTime" is duplicated, False otherwise
+    return not df.select(pl.struct("Time", "PTime").is_duplicated().any()).item()
 
 
 
 def make_df_more_readable(
-        pl_data: pl.DataFrame
-) -> pl.DataFrame:
+        pl_data: Union[pl.DataFrame, pl.LazyFrame]
+) -> Union[pl.DataFrame, pl.LazyFrame]:
     """Reorganize the columns of a DataFrame for improved readability.
 
     This function rearranges the columns of the provided DataFrame by grouping them into 
@@ -37,58 +31,90 @@ def make_df_more_readable(
     is structured to enhance clarity, especially when saved to a CSV file.
 
     Args:
-        pl_data (pl.DataFrame): The DataFrame to be reorganized.
+        pl_data (Union[pl.DataFrame, pl.LazyFrame]): The DataFrame or LazyFrame to be reorganized.
 
     Returns:
-        pl.DataFrame: A new DataFrame with columns ordered for better readability.
+        Union[pl.DataFrame, pl.LazyFrame]: A new frame, of the same type as the input, with columns ordered for better readability.
     """
 
     # Order the columns of the dataframe - this is done only to make the resulting csv file more readable
-    filepath_col = sorted([col for col in pl_data.columns if "filepath" in col.lower()], key=lambda x: x.lower())
-    price_cols = sorted([col for col in pl_data.columns if "price" in col.lower()], key=lambda x: x.lower())
-    time_cols = sorted([col for col in pl_data.columns if "time" in col.lower()], key=lambda x: x.lower())
-    other_cols = sorted([col for col in pl_data.columns if col not in price_cols and col not in time_cols and col not in filepath_col], key=lambda x: x.lower())
-    pl_data = pl_data.select(filepath_col + time_cols + price_cols + other_cols)
+    # Each column name is lowercased once and put in the first matching group
+    filepath_cols, time_cols, price_cols, other_cols = [], [], [], []
+    for col in pl_data.collect_schema().names():
+        col_lower = col.lower()
+        if "filepath" in col_lower:
+            filepath_cols.append((col_lower, col))
+        elif "price" in col_lower:
+            price_cols.append((col_lower, col))
+        elif "time" in col_lower:
+            time_cols.append((col_lower, col))
+        else:
+            other_cols.append((col_lower, col))
+    pl_data = pl_data.select([col for col_group in (filepath_cols, time_cols, price_cols, other_cols) for _, col in sorted(col_group)])
     return pl_data
 
 
+def forecast_metric_expressions(
+        region: str,
+        epsilon: float = 1e-10
+) -> List[pl.Expr]:
+    """Build the MAE, MSE, and MAPE expressions for the forecasted prices of a single region.
+
+    The expressions read the forecast residual from the 'Residual_<region>' column, so the residual 
+    is computed once and not once per metric. The RMSE is not included, as it is derived from the MSE.
+
+    Args:
+        region (str): The region to build the metric expressions for, e.g. "DK1".
+        epsilon (float, optional): A small value used in place of zero auction prices to avoid division by zero. 
+            Defaults to 1e-10.
+
+    Returns:
+        List[pl.Expr]: The MAE, MSE, and MAPE expressions, aliased with the region as suffix.
+    """
+    auction_price = pl.col(f"Auction_Price_{region}")
+    residual = pl.col(f"Residual_{region}")
+    return [
+        residual.abs().mean().alias(f"MAE_{region}"),
+        (residual * residual).mean().alias(f"MSE_{region}"),
+        (residual.abs() / pl.when(auction_price == 0).then(epsilon).otherwise(auction_price)).mean().alias(f"MAPE_{region}"),
+    ]
+
+
 def compute_forecast_metrics(
-        pl_data: pl.DataFrame
+        pl_data: Union[pl.DataFrame, pl.LazyFrame]
 ) -> Tuple[pl.DataFrame, pl.DataFrame]:
     """Calculate forecast accuracy metrics for DK1 and DK2.
 
     This function computes various metrics including Mean Absolute Error (MAE), Mean Squared Error (MSE), 
     Root Mean Squared Error (RMSE), and Mean Absolute Percentage Error (MAPE) for the forecasted prices 
     of DK1 and DK2 compared to their respective auction prices. The results are returned as two separate 
-    DataFrames for further analysis.
+    DataFrames for further analysis. A LazyFrame input is collected here, together with the metric expressions.
 
     Args:
-        pl_data (pl.DataFrame): A DataFrame containing forecasted and auction prices for DK1 and DK2.
+        pl_data (Union[pl.DataFrame, pl.LazyFrame]): A DataFrame or LazyFrame containing forecasted and auction prices for DK1 and DK2.
 
     Returns:
         Tuple[pl.DataFrame, pl.DataFrame]: Two DataFrames containing the computed metrics for DK1 and DK2.
     """
 
     epsilon = 1e-10  # Define a small epsilon to avoid division by zero
-
-    # Calculate MAE, MSE, RMSE, and MAPE for DK1
-    metrics_dk1 = pl_data.select([
-        (pl.col("DK1_forecast_price") - pl.col("Auction_Price_DK1")).abs().mean().alias("MAE_DK1"),
-        (pl.col("DK1_forecast_price") - pl.col("Auction_Price_DK1")).pow(2).mean().alias("MSE_DK1"),
-        (pl.col("DK1_forecast_price") - pl.col("Auction_Price_DK1")).pow(2).mean().sqrt().alias("RMSE_DK1"),
-        ((pl.col("DK1_forecast_price") - pl.col("Auction_Price_DK1")).abs() /
-        pl.when(pl.col("Auction_Price_DK1") == 0).then(epsilon).otherwise(pl.col("Auction_Price_DK1"))
-        ).mean().alias("MAPE_DK1")
-    ])
-
-    # Calculate metrics for DK2
-    metrics_dk2 = pl_data.select([
-        (pl.col("DK2_forecast_price") - pl.col("Auction_Price_DK2")).abs().mean().alias("MAE_DK2"),
-        (pl.col("DK2_forecast_price") - pl.col("Auction_Price_DK2")).pow(2).mean().alias("MSE_DK2"),
-        (pl.col("DK2_forecast_price") - pl.col("Auction_Price_DK2")).pow(2).mean().sqrt().alias("RMSE_DK2"),
-        ((pl.col("DK2_forecast_price") - pl.col("Auction_Price_DK2")).abs() /
-        pl.when(pl.col("Auction_Price_DK2") == 0).then(epsilon).otherwise(pl.col("Auction_Price_DK2"))
-        ).mean().alias("MAPE_DK2")
-    ])
-
-    return metrics_dk1, metrics_dk2
\ No newline at end of file
+    regions = ["DK1", "DK2"]
+
+    # Compute the residuals once per region, and then MAE, MSE, and MAPE for both regions in a single pass over the data
+    metrics = pl_data.lazy().with_columns([
+        (pl.col(f"{region}_forecast_price") - pl.col(f"Auction_Price_{region}")).alias(f"Residual_{region}") for region in regions
+    ]).select(
+        [metric_expr for region in regions for metric_expr in forecast_metric_expressions(region=region, epsilon=epsilon)]
+    ).collect()
+
+    # Split the metrics into one dataframe per region - the RMSE is derived from the already computed MSE
+    metrics_dk1, metrics_dk2 = [
+        metrics.select([
+            pl.col(f"MAE_{region}"),
+            pl.col(f"MSE_{region}"),
+            pl.col(f"MSE_{region}").sqrt().alias(f"RMSE_{region}"),
+            pl.col(f"MAPE_{region}"),
+        ])
+        for region in regions
+    ]
+    return metrics_dk1, metrics_dk2